@@ -1,6 +1,68 @@
 import sys
-import boto3
+import time
+import asyncio
+from contextlib import aclosing
+import aioboto3
+from aiobotocore.config import AioConfig
+from dataclasses import dataclass, field
+from typing import AsyncIterator
 import unittest
+import unittest.mock
+
+# shared by all EMRContainers instances so the service model and credentials are loaded once per process
+_SESSION = aioboto3.Session()
+
+# spark-env export routing the driver/executor JVMs through the web proxy, S3 excepted
+_SPARK_ENV_EXPORT = (
+    {
+        "classification": "export",
+        "properties": {
+            "_JAVA_OPTIONS": '"$_JAVA_OPTIONS -Dhttp.proxyHost=applicationwebproxy.nomura.com -Dhttp.proxyPort=80 -Dhttp.nonProxyHosts=s3.amazonaws.com"'
+        }
+    },
+)
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SparkJobSpec:
+    """ Everything start_spark_job needs to submit one Spark job; build it once and reuse it to resubmit.
+
+    Parameter value examples:
+        namespace = 'emr-karpenter'
+        execution_arn = 'arn'
+        s3_bucket = 'bucket_name'
+        job_name = 'emr-spark-python'
+        log_group = "/emr-on-eks-spark"
+        log_stream_prefix = "spark_log_stream_prefix"
+        db_conn_url = "jdbc:mysql://MYS00629:3306/ndm_iceberg_metadata"
+        user_name = "ndm_iceberg_admin"
+        password = "ml6PJlu_G"
+        entry_point = "s3://S3Bucket/simplehive.py"
+        jars = "s3://S3Bucket/mysql-connector-java-8.0.30.jar"
+        arguments = ("s3://S3Bucket",)
+        driver_cores = "1"
+        executor_cores = "1"
+        executor_memory = "4G"
+    """
+    namespace: str
+    execution_arn: str
+    s3_bucket: str
+    job_name: str
+    log_group: str
+    log_stream_prefix: str
+    db_conn_url: str
+    user_name: str
+    # kept out of repr so printing or logging a spec does not leak the metastore password
+    password: str = field(repr=False)
+    entry_point: str
+    jars: str
+    arguments: tuple
+    driver_cores: str
+    executor_cores: str
+    executor_memory: str
+
+def _get_ns(vc: dict) -> str:
+    # EKS virtual clusters always carry containerProvider.info.eksInfo, so plain subscripts are safe
+    return vc['containerProvider']['info']['eksInfo']['namespace']
 
 class EMRContainers:
     """
@@ -13,145 +75,275 @@ class EMRContainers:
     - canceling job
     
 
-    By default, all calls are synchronous in that they wait for the Application to reach the desired state.
-    - `run_spark_job` waits until the job is in a terminal state.
+    All calls are coroutines backed by an aioboto3 client, so callers can
+    `asyncio.gather` many start/describe/list calls and overlap their network latency.
+    The client is opened by `connect()`, or by using the instance as an async context manager:
+
+        async with EMRContainers('us-east-1') as emr:
+            job_id = await emr.start_spark_job(...)
     """
+    __slots__ = (
+        'region',
+        'client',
+        'job_id',
+        'virtual_cluster_id',
+        '_ns_cache',
+        '_ns_lock',
+        '_job_waits',
+        '_poll_task',
+        '_semaphore',
+    )
+
+    # EMR on EKS release every job is submitted with
+    RELEASE_LABEL = "emr-6.15.0-20231109"
+    # seconds EMR waits for a job to start before failing it (emr-containers-defaults job-start-timeout)
+    JOB_START_TIMEOUT = "600"
+    # seconds a namespace -> virtual cluster id mapping is trusted before list_virtual_clusters is called again
+    NS_CACHE_TTL = 300
+    # page size requested from the list_* paginators
+    PAGE_SIZE = 50
+    # seconds between list_job_runs calls made by the shared job poller
+    POLL_INTERVAL = 15
+    # job run states that are not terminal yet
+    ACTIVE_STATES = ['PENDING', 'SUBMITTED', 'RUNNING']
+    # upper bound on in-flight requests issued by describe_jobs / cancel_jobs
+    MAX_CONCURRENCY = 20
+    # adaptive retries add client-side rate limiting on ThrottlingException; the pool
+    # is sized above MAX_CONCURRENCY so gathered calls do not queue on connections
+    CLIENT_CONFIG = AioConfig(
+        retries={'mode': 'adaptive', 'max_attempts': 10},
+        connect_timeout=5,
+        read_timeout=30,
+        max_pool_connections=50,
+    )
+
+    # applicationConfiguration entries that do not depend on start_spark_job arguments;
+    # shared by every call and never mutated
+    _APP_CONFIG_STATIC = (
+        {
+            "classification": "emr-containers-defaults",
+            "properties": {
+                "job-start-timeout": JOB_START_TIMEOUT
+            }
+        },
+        {
+            "classification": "spark-defaults",
+            "properties": {
+                "spark.dynamicAllocation.enabled": "false",
+                "spark.kubernetes.executor.deleteOnTermination": "true"
+            }
+        },
+        {
+            "classification": "spark-env",
+            "properties": {
+            },
+            "configurations": list(_SPARK_ENV_EXPORT)
+        },
+    )
+    # spark-hive-site properties merged with the per-job metastore credentials
+    _HIVE_SITE_STATIC = {
+        "hive.metastore.client.factory.class": "org.apache.hadoop.hive.ql.metadata.SessionHiveMetaStoreClientFactory",
+        "javax.jdo.option.ConnectionDriverName": "com.mysql.cj.jdbc.Driver",
+    }
+
     def __init__(self, REGION: str) -> None:
-        self.client = boto3.client(
+        self.region = REGION
+        self.client = None
+        # last job submitted by start_spark_job, reported by __str__
+        self.job_id = None
+        self.virtual_cluster_id = None
+        # namespace -> (virtual cluster id, or None when no running cluster serves it, timestamp)
+        self._ns_cache: dict[str, tuple[str, float]] = {}
+        # serialises refreshes so concurrent lookups on a cold cache share one listing
+        self._ns_lock = asyncio.Lock()
+        # (job id, virtual cluster id) -> future resolved by the poller once the job leaves the active listing
+        self._job_waits: dict[tuple[str, str], asyncio.Future] = {}
+        self._poll_task = None
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+    async def connect(self) -> "EMRContainers":
+        if self.client is not None:
+            # already connected; opening another client would leak this one's connection pool
+            return self
+        self.client = await _SESSION.client(
              "emr-containers", 
-             region_name=REGION
-        )
+             region_name=self.region,
+             config=self.CLIENT_CONFIG
+        ).__aenter__()
+        return self
+
+    async def close(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._job_waits.clear()
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def __aenter__(self) -> "EMRContainers":
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
     def __str__(self):
         return f"EMR Containers Job: {self.job_id} Virtual Cluster: {self.virtual_cluster_id}" 
     
-    """ Parameter value examples to start a Spark job:
-        REGION = 'eu-west-2'
-        NAME_SPACE = 'emr-karpenter'
-        EMR_EKS_EXECUTION_ARN = 'arn'
-        S3_BUCKET = 'bucket_name'
-        JOB_NAME = 'emr-spark-python'
-        LOG_GROUP = "/emr-on-eks-spark"
-        LOG_STREAM_PREFIX = "spark_log_stream_prefix"
-        DB_CONN_URL = "jdbc:mysql://MYS00629:3306/ndm_iceberg_metadata"
-        USER_NAME = "ndm_iceberg_admin"
-        PASSWORD = "ml6PJlu_G"
-        EntryPoint = "s3://S3Bucket/simplehive.py"
-        JARS = "s3://S3Bucket/mysql-connector-java-8.0.30.jar"
-    """
-    def start_spark_job(
-        self, 
-        NAME_SPACE: str,
-        EMR_EKS_EXECUTION_ARN: str,
-        S3_BUCKET: str,
-        JOB_NAME: str,
-        LOG_GROUP: str,
-        LOG_STREAM_PREFIX: str,
-        DB_CONN_URL: str,
-        USER_NAME: str,
-        PASSWORD: str,
-        EntryPoint: str,
-        JARS: str,
-        Arguments: list(),
-        Driver_cores: str,
-        Executor_cores: str,
-        Executor_memory: str,
-
-        #wait: bool = True,
-    ) -> str:
-        EMR_EKS_CLUSTER_ID = self.get_cluster_by_ns(NAME_SPACE)
-
-        response = self.client.start_job_run(
-        name=JOB_NAME,
+    async def start_spark_job(self, spec: SparkJobSpec, wait: bool = False) -> str:
+        EMR_EKS_CLUSTER_ID = await self.get_cluster_by_ns(spec.namespace)
+
+        response = await self.client.start_job_run(
+        name=spec.job_name,
         virtualClusterId=EMR_EKS_CLUSTER_ID,
-        executionRoleArn=EMR_EKS_EXECUTION_ARN,
-        releaseLabel='emr-6.15.0-20231109',
+        executionRoleArn=spec.execution_arn,
+        releaseLabel=self.RELEASE_LABEL,
         jobDriver={
           'sparkSubmitJobDriver': {
-            "entryPoint": EntryPoint,
-            "entryPointArguments": Arguments,
-            "sparkSubmitParameters": "--jars " + JARS + " --conf spark.executor.memory=" + Executor_memory + " --conf spark.executor.cores=" + Executor_cores + " --conf spark.driver.cores=" + Driver_cores
+            "entryPoint": spec.entry_point,
+            "entryPointArguments": list(spec.arguments),
+            "sparkSubmitParameters": f"--jars {spec.jars} --conf spark.executor.memory={spec.executor_memory} --conf spark.executor.cores={spec.executor_cores} --conf spark.driver.cores={spec.driver_cores}"
           }
         },
         configurationOverrides={
-        'monitoringConfiguration': {
-            "cloudWatchMonitoringConfiguration": {
-               "logGroupName": LOG_GROUP,
-               "logStreamNamePrefix": LOG_STREAM_PREFIX
-             },
-             "s3MonitoringConfiguration": {
-               "logUri": "s3://"+S3_BUCKET
-             }
-        
-        },
-        "applicationConfiguration":
-        [
-        {
-         "classification": "emr-containers-defaults",
-          "properties": {
-             "job-start-timeout":"600"
-          }
-        },
-        {
-          "classification": "spark-defaults",
-          "properties": {
-            "spark.dynamicAllocation.enabled": "false",
-            "spark.kubernetes.executor.deleteOnTermination": "true"
-         }
-
-        },
-        {
-          "classification": "spark-hive-site",
-          "properties": {
-	          "hive.metastore.client.factory.class": "org.apache.hadoop.hive.ql.metadata.SessionHiveMetaStoreClientFactory",
-	          "javax.jdo.option.ConnectionDriverName": "com.mysql.cj.jdbc.Driver",
-            "javax.jdo.option.ConnectionUserName": USER_NAME,
-            "javax.jdo.option.ConnectionPassword": PASSWORD,
-            "javax.jdo.option.ConnectionURL": DB_CONN_URL
-         }
-        },
-        {
-          "classification": "spark-env",
-          "properties": {
-          },
-          "configurations": [
-          {
-            "classification": "export",
-            "properties": {
-                "_JAVA_OPTIONS": "\"$_JAVA_OPTIONS -Dhttp.proxyHost=applicationwebproxy.nomura.com -Dhttp.proxyPort=80 -Dhttp.nonProxyHosts=s3.amazonaws.com\""
-            }
-          }
-          ]
-        }
-        ]})
-        job_id = response.get("id")
+            "monitoringConfiguration": {
+                "cloudWatchMonitoringConfiguration": {
+                    "logGroupName": spec.log_group,
+                    "logStreamNamePrefix": spec.log_stream_prefix
+                },
+                "s3MonitoringConfiguration": {
+                    "logUri": f"s3://{spec.s3_bucket}"
+                }
+            },
+            "applicationConfiguration": [
+                *self._APP_CONFIG_STATIC,
+                {
+                    "classification": "spark-hive-site",
+                    "properties": {
+                        **self._HIVE_SITE_STATIC,
+                        "javax.jdo.option.ConnectionUserName": spec.user_name,
+                        "javax.jdo.option.ConnectionPassword": spec.password,
+                        "javax.jdo.option.ConnectionURL": spec.db_conn_url
+                    }
+                }
+            ]
+        })
+        job_id = response["id"]
+        self.job_id = job_id
+        self.virtual_cluster_id = EMR_EKS_CLUSTER_ID
+        if wait:
+            await self.wait_for_job(job_id, EMR_EKS_CLUSTER_ID)
         return job_id
-        """            "_JAVA_OPTIONS": "\"$_JAVA_OPTIONS -Dhttp.proxyHost=applicationwebproxy.nomura.com -Dhttp.proxyPort=80 -Dhttp.nonProxyHosts=s3.amazonaws.com\""
+
+    async def wait_for_job(self, job_id: str, virtual_cluster_id: str) -> dict:
         """
-        """         job_done = False
-        while wait and not job_done:
-            jr_response = self.get_job_run(job_id)
-            job_done = jr_response.get("state") in [
-                "COMPLETED",
-                "FAILED",
-                "CANCEL_PENDING",
-                "CANCELLED",
-            ] 
-        return job_id
+        Wait until the job run leaves ACTIVE_STATES and return its final description.
+
+        All waiters share one background poller, which issues a single list_job_runs
+        per virtual cluster every POLL_INTERVAL seconds instead of one describe_job_run per job.
+        A job missing from that listing is confirmed with describe_job before returning, since a
+        freshly started job may not be listed yet.
         """
+        key = (job_id, virtual_cluster_id)
+        while True:
+            done = self._job_waits.get(key)
+            if done is None:
+                done = self._job_waits[key] = asyncio.get_running_loop().create_future()
+            if self._poll_task is None or self._poll_task.done():
+                self._poll_task = asyncio.create_task(self._poll_all())
 
-    def describe_job(self, job_id: str, virtual_cluster_id: str) -> dict:
-        response = self.client.describe_job_run(
+            # close() or another waiter may replace self._poll_task while we wait, so hold on to this one
+            poller = self._poll_task
+            await asyncio.wait({done, poller}, return_when=asyncio.FIRST_COMPLETED)
+            if not done.done():
+                # the poller was cancelled or died, surface that to the caller
+                poller.result()
+            # re-raises the error listing this job's virtual cluster failed with, if any
+            done.result()
+
+            job_run = await self.describe_job(job_id, virtual_cluster_id)
+            if job_run["state"] not in self.ACTIVE_STATES:
+                return job_run
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _poll_all(self) -> None:
+        while self._job_waits:
+            for vc_id in {vc_id for _, vc_id in self._job_waits}:
+                # snapshot before listing so jobs registered mid-listing are checked next tick
+                pending = [key for key in self._job_waits if key[1] == vc_id]
+                active = set()
+                try:
+                    paginator = self.client.get_paginator('list_job_runs')
+                    async for page in paginator.paginate(
+                        virtualClusterId=vc_id,
+                        states=self.ACTIVE_STATES,
+                        PaginationConfig={'PageSize': self.PAGE_SIZE},
+                    ):
+                        active.update(job_run["id"] for job_run in page["jobRuns"])
+                except Exception as error:
+                    # only this cluster's waiters fail; the poller keeps serving the others.
+                    # Drop the traceback: it references this still-running frame, and a caller
+                    # clearing it (e.g. assertRaises) would close the poller coroutine.
+                    error = error.with_traceback(None)
+                    for key in pending:
+                        done = self._job_waits.pop(key, None)
+                        if done is not None and not done.done():
+                            done.set_exception(error)
+                    continue
+
+                for key in pending:
+                    if key[0] not in active and key in self._job_waits:
+                        done = self._job_waits.pop(key)
+                        if not done.done():
+                            done.set_result(None)
+
+            if self._job_waits:
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def describe_job(self, job_id: str, virtual_cluster_id: str) -> dict:
+        response = await self.client.describe_job_run(
             id=job_id, 
             virtualClusterId=virtual_cluster_id
         )
-        return response.get("jobRun")
+        return response["jobRun"]
     
-    def cancel_job(self, job_id: str, virtual_cluster_id: str) -> dict:
-        response = self.client.cancel_job_run(
+    async def cancel_job(self, job_id: str, virtual_cluster_id: str) -> dict:
+        if not job_id or not virtual_cluster_id:
+            raise ValueError("cancel_job requires both job_id and virtual_cluster_id")
+
+        response = await self.client.cancel_job_run(
             id=job_id,
-            irtualClusterId=virtual_cluster_id
+            virtualClusterId=virtual_cluster_id
+        )
+        # CancelJobRun only echoes the ids back, there is no jobRun in the response
+        return {"id": response["id"], "virtualClusterId": response["virtualClusterId"]}
+
+    async def describe_jobs(self, pairs: list, return_exceptions: bool = False) -> list:
+        """
+        Describe many (job_id, virtual_cluster_id) pairs concurrently, at most MAX_CONCURRENCY at a time.
+        Results are returned in the order of `pairs`. By default the first error is raised and the other
+        results are lost; with `return_exceptions=True` each failure is returned in its pair's slot instead.
+        """
+        return await asyncio.gather(
+            *(self._bounded(self.describe_job(job_id, vc_id)) for job_id, vc_id in pairs),
+            return_exceptions=return_exceptions,
+        )
+
+    async def cancel_jobs(self, pairs: list, return_exceptions: bool = False) -> list:
+        """
+        Cancel many (job_id, virtual_cluster_id) pairs concurrently, at most MAX_CONCURRENCY at a time.
+        Results are returned in the order of `pairs`. By default the first error (e.g. a job that already
+        ended) is raised while the remaining cancels still go out; pass `return_exceptions=True` to get
+        every outcome, with failures returned in their pair's slot.
+        """
+        return await asyncio.gather(
+            *(self._bounded(self.cancel_job(job_id, vc_id)) for job_id, vc_id in pairs),
+            return_exceptions=return_exceptions,
         )
-        return response.get("jobRun")
+
+    async def _bounded(self, coro):
+        async with self._semaphore:
+            return await coro
     
     """ Parameter value example for list_job_runs
     virtualClusterId='string',
@@ -164,27 +356,26 @@ class EMRContainers:
     maxResults=123,
     nextToken='string'
     """
-    def list_jobs(self, 
+    async def list_jobs(self, 
             NAME_SPACE: str,
             created_before: str,
             created_after: str,
             #name: str,            
             states: list,
-            #maxResults: int,
-            #nextToken: str,
-        ) -> dict:
-        virtual_cluster_id = self.get_cluster_by_ns(NAME_SPACE)
+        ) -> AsyncIterator[dict]:
+        virtual_cluster_id = await self.get_cluster_by_ns(NAME_SPACE)
 
-        response = self.client.list_job_runs(
+        paginator = self.client.get_paginator('list_job_runs')
+        async for page in paginator.paginate(
             virtualClusterId=virtual_cluster_id,
             createdBefore=created_before,
             createdAfter=created_after,
             #name=name,
             states=states,
-            #maxResults=maxResults,
-            #nextToken=nextToken
-        )
-        return response.get("jobRuns") 
+            PaginationConfig={'PageSize': self.PAGE_SIZE},
+        ):
+            for job_run in page["jobRuns"]:
+                yield job_run
     
     """ Parameter value example for list_virtual_clusters:
     containerProviderId='string',
@@ -197,86 +388,353 @@ class EMRContainers:
     maxResults=123,
     nextToken='string'
     """    
-    def list_clusters(self, 
+    async def list_clusters(self, 
             container_provider_type: str,
             states: list,
-        ) -> dict:
-        response = self.client.list_virtual_clusters(
+            container_provider_id: str = None,
+        ) -> AsyncIterator[dict]:
+        filters = {}
+        if container_provider_id is not None:
+            filters['containerProviderId'] = container_provider_id
+
+        paginator = self.client.get_paginator('list_virtual_clusters')
+        async for page in paginator.paginate(
             containerProviderType=container_provider_type,
             states=states,
-        )
-        return response.get("virtualClusters") 
+            PaginationConfig={'PageSize': self.PAGE_SIZE},
+            **filters,
+        ):
+            for vc in page["virtualClusters"]:
+                yield vc
     
-    def get_cluster_by_ns (self, tenant_ns: str,) -> str:
-        resp = self.list_clusters( 'EKS', ['RUNNING'])
-        for vc in resp:
-            namespace = vc['containerProvider'].get('info').get('eksInfo').get('namespace')
-            if tenant_ns == namespace:
-                return vc['id']
+    async def get_cluster_by_ns (self, tenant_ns: str,) -> str:
+        return (await self.get_clusters_by_ns([tenant_ns])).get(tenant_ns)
+
+    async def get_clusters_by_ns(self, tenant_ns_list: list) -> dict:
+        """
+        Resolve several tenant namespaces to virtual cluster ids with at most one list_virtual_clusters call.
+        Namespaces without a running virtual cluster are left out of the result.
+        """
+        if self._stale_namespaces(tenant_ns_list):
+            async with self._ns_lock:
+                # a refresh that finished while we waited for the lock may already cover us
+                stale = self._stale_namespaces(tenant_ns_list)
+                if stale:
+                    await self._refresh_ns_cache(stale, time.monotonic())
+
+        return {
+            ns: self._ns_cache[ns][0]
+            for ns in set(tenant_ns_list)
+            if ns in self._ns_cache and self._ns_cache[ns][0] is not None
+        }
 
-        return None
+    def _stale_namespaces(self, tenant_ns_list: list) -> set:
+        now = time.monotonic()
+        return {
+            ns for ns in tenant_ns_list
+            if ns not in self._ns_cache or now - self._ns_cache[ns][1] > self.NS_CACHE_TTL
+        }
+
+    async def _refresh_ns_cache(self, wanted: set, now: float) -> None:
+        # the first cluster listed for a namespace wins, and listing stops as soon as every
+        # wanted namespace has been seen; clusters seen on the way are cached too
+        for ns in wanted:
+            self._ns_cache.pop(ns, None)
+        wanted = set(wanted)
+        seen = set()
+        async with aclosing(self.list_clusters( 'EKS', ['RUNNING'])) as clusters:
+            async for vc in clusters:
+                namespace = _get_ns(vc)
+                if namespace in seen:
+                    continue
+                seen.add(namespace)
+                self._ns_cache[namespace] = (vc['id'], now)
+                wanted.discard(namespace)
+                if not wanted:
+                    break
+
+        # whatever is left was not found in a full listing; remember the miss for NS_CACHE_TTL too
+        for ns in wanted:
+            self._ns_cache[ns] = (None, now)
 
 # python3 -m unittest emr_containers.MyTestClass.testStartAndDesc
-class MyTestClass(unittest.TestCase):
+class MyTestClass(unittest.IsolatedAsyncioTestCase):
+
+    async def testStartAndDesc(self):
+        async with EMRContainers('us-east-1') as emr:
+            spec = SparkJobSpec(
+                namespace="emr",
+                execution_arn="arn:aws:iam::339573364106:role/HiveEMRonEKS-sparkpermissionEMRJobExecRoleF94B9453-SKEn32xWEtxU",
+                s3_bucket="hiveemroneks-appcode291f5ddb-udcvqqljbqz6",
+                job_name="hiveJdbcBoto3Test",
+                log_group="/emr-on-eks",
+                log_stream_prefix="jdbc-hive",
+                db_conn_url="jdbc:mysql://hiveemroneks-rdsaurora6c66f7da-ibwxobqw6rrd.cluster-csin4exixsgc.us-east-1.rds.amazonaws.com:3306/HiveEMRonEKS",
+                user_name="admin",
+                password="^GJ6agb4Cv,Ng8PQs_LgEJecoWmaO2",
+                entry_point="s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6/app_code/job/hivejdbc1.py",
+                jars="s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6/mysql-connector-java-8.0.28.jar",
+                arguments=('s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6',),
+                driver_cores="1",
+                executor_cores="1",
+                executor_memory="4G",
+            )
+            job_id = await emr.start_spark_job(spec)
+
+            print("Started job = " + job_id)
+
+            resp = await emr.describe_job(job_id, "7jikhd68rwbq1bom3judznz13")
+            print(resp)
+
+            resp = await emr.describe_jobs([(job_id, "7jikhd68rwbq1bom3judznz13")])
+            print(resp)
+
+    async def testListJobs(self):
+        async with EMRContainers('us-east-1') as emr:
+            resp = [job_run async for job_run in emr.list_jobs(
+                "emr",
+                "2024-1-19T00:00:00Z",
+                "2023-12-31T00:00:00Z",
+                ["RUNNING", "COMPLETED", "FAILED"],
+            )]
+            print(resp)
+
+    async def testListClusters(self):
+        async with EMRContainers('us-east-1') as emr:
+            resp = [vc async for vc in emr.list_clusters("EKS", ["RUNNING"])]
+            print(resp)
+
+    async def testGetClusterByNs(self):
+        async with EMRContainers('us-east-1') as emr:
+            ns = "emr-eks-workshop-namespace"
+            id = await emr.get_cluster_by_ns(ns)
+            print("Virtual-Cluster-Id " + id + " for namespace " + ns)
+
+            ns1 = "emr"
+            id1 = await emr.get_cluster_by_ns(ns1)
+            print("Virtual-Cluster-Id " + id1 + " for namespace " + ns1)
+
+            ns2 = "non-exiting-emr"
+            id2 = await emr.get_cluster_by_ns(ns2)
+            if id2 is None:
+                print("Virtual-Cluster-Id for namespace " + ns2 + " does not exist")
+
+    async def testGetClustersByNs(self):
+        async with EMRContainers('us-east-1') as emr:
+            ids = await emr.get_clusters_by_ns(["emr-eks-workshop-namespace", "emr", "non-exiting-emr"])
+            print(ids)
+        
+class _StubJobRunsClient:
+    """ Offline stand-in for the emr-containers client.
+
+    list_job_runs reports the ids in `active`, or raises errors[virtualClusterId];
+    describe_job_run walks through states[job_id] one call at a time and then stays on the last one.
+    """
+    def __init__(self, active=(), errors=None, states=None):
+        self.active = set(active)
+        self.errors = errors or {}
+        self.states = states or {}
+
+    def get_paginator(self, operation_name):
+        return self
+
+    async def paginate(self, virtualClusterId, **kwargs):
+        if virtualClusterId in self.errors:
+            raise self.errors[virtualClusterId]
+        yield {"jobRuns": [{"id": job_id} for job_id in self.active]}
+
+    async def describe_job_run(self, id, virtualClusterId):
+        states = self.states.get(id, ["COMPLETED"])
+        state = states.pop(0) if len(states) > 1 else states[0]
+        return {"jobRun": {"id": id, "virtualClusterId": virtualClusterId, "state": state}}
+
+    async def close(self):
+        pass
+
+class _StubJobCallsClient:
+    """ Offline stand-in for the emr-containers client that records how many describe/cancel calls overlap.
+    Cancelling a job listed in `ended` raises, like CancelJobRun on a finished job.
+    """
+    def __init__(self, ended=()):
+        self.ended = set(ended)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+    async def describe_job_run(self, id, virtualClusterId):
+        await self._call()
+        return {"jobRun": {"id": id, "virtualClusterId": virtualClusterId, "state": "RUNNING"}}
 
-    def testStartAndDesc(self):
+    async def cancel_job_run(self, id, virtualClusterId):
+        await self._call()
+        if id in self.ended:
+            raise RuntimeError(f"ValidationException: job {id} already ended")
+        return {"id": id, "virtualClusterId": virtualClusterId}
+
+    async def close(self):
+        pass
+
+# python3 -m unittest emr_containers.FanOutTestClass
+class FanOutTestClass(unittest.IsolatedAsyncioTestCase):
+
+    async def testDescribeJobsBoundedAndOrdered(self):
+        with unittest.mock.patch.object(EMRContainers, 'MAX_CONCURRENCY', 3):
+            emr = EMRContainers('us-east-1')
+        emr.client = _StubJobCallsClient()
+        pairs = [(f"job-{i}", "vc-1") for i in range(10)]
+
+        job_runs = await emr.describe_jobs(pairs)
+
+        self.assertEqual([job_run["id"] for job_run in job_runs], [job_id for job_id, _ in pairs])
+        self.assertEqual(emr.client.max_in_flight, 3)
+
+    async def testCancelJobsReturnExceptions(self):
         emr = EMRContainers('us-east-1')
+        emr.client = _StubJobCallsClient(ended=["job-1"])
+        pairs = [("job-0", "vc-1"), ("job-1", "vc-1"), ("job-2", "vc-1")]
 
-        job_id = emr.start_spark_job("emr",
-        "arn:aws:iam::339573364106:role/HiveEMRonEKS-sparkpermissionEMRJobExecRoleF94B9453-SKEn32xWEtxU",
-        "hiveemroneks-appcode291f5ddb-udcvqqljbqz6",
-        "hiveJdbcBoto3Test",
-        "/emr-on-eks",
-        "jdbc-hive",
-        "jdbc:mysql://hiveemroneks-rdsaurora6c66f7da-ibwxobqw6rrd.cluster-csin4exixsgc.us-east-1.rds.amazonaws.com:3306/HiveEMRonEKS",
-        "admin",
-        "^GJ6agb4Cv,Ng8PQs_LgEJecoWmaO2",
-        "s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6/app_code/job/hivejdbc1.py",
-        "s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6/mysql-connector-java-8.0.28.jar",
-        ['s3://hiveemroneks-appcode291f5ddb-udcvqqljbqz6'],
-        "1",
-        "1",
-        "4G"
-        )
+        with self.assertRaisesRegex(RuntimeError, "job-1 already ended"):
+            await emr.cancel_jobs(pairs)
+
+        results = await emr.cancel_jobs(pairs, return_exceptions=True)
+        self.assertEqual(results[0], {"id": "job-0", "virtualClusterId": "vc-1"})
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], {"id": "job-2", "virtualClusterId": "vc-1"})
 
-        print("Started job = " + job_id)
+class _StubVirtualClustersClient:
+    """ Offline stand-in for the emr-containers client: list_virtual_clusters serves `pages`,
+    each a list of (namespace, virtual cluster id) pairs, and counts listings and pages fetched.
+    """
+    def __init__(self, pages):
+        self.pages = pages
+        self.listings = 0
+        self.pages_fetched = 0
+
+    def get_paginator(self, operation_name):
+        return self
+
+    async def paginate(self, **kwargs):
+        self.listings += 1
+        for page in self.pages:
+            self.pages_fetched += 1
+            await asyncio.sleep(0)
+            yield {"virtualClusters": [
+                {"id": vc_id, "containerProvider": {"info": {"eksInfo": {"namespace": ns}}}}
+                for ns, vc_id in page
+            ]}
+
+    async def close(self):
+        pass
 
-        resp = emr.describe_job(job_id, "7jikhd68rwbq1bom3judznz13")
-        print(resp)
+# python3 -m unittest emr_containers.NamespaceCacheTestClass
+class NamespaceCacheTestClass(unittest.IsolatedAsyncioTestCase):
 
-    def testListJobs(self):
+    def _emr(self, pages):
         emr = EMRContainers('us-east-1')
+        emr.client = _StubVirtualClustersClient(pages)
+        return emr
+
+    async def testHitDoesNotRelist(self):
+        emr = self._emr([[("a", "vc-a"), ("b", "vc-b")]])
+
+        self.assertEqual(await emr.get_cluster_by_ns("b"), "vc-b")
+        # "a" was seen on the way to "b", "b" itself is a plain hit
+        self.assertEqual(await emr.get_cluster_by_ns("a"), "vc-a")
+        self.assertEqual(await emr.get_cluster_by_ns("b"), "vc-b")
+        self.assertEqual(emr.client.listings, 1)
+
+    async def testMissIsCached(self):
+        emr = self._emr([[("a", "vc-a")]])
+
+        for _ in range(3):
+            self.assertIsNone(await emr.get_cluster_by_ns("missing"))
+            self.assertEqual(await emr.get_clusters_by_ns(["a", "missing"]), {"a": "vc-a"})
+        self.assertEqual(emr.client.listings, 1)
 
-        resp = emr.list_jobs(
-            "emr",
-            "2024-1-19T00:00:00Z",
-            "2023-12-31T00:00:00Z",
-            ["RUNNING", "COMPLETED", "FAILED"],
+    async def testStaleEntryIsRefreshed(self):
+        emr = self._emr([[("a", "vc-a")]])
+        await emr.get_cluster_by_ns("a")
+
+        vc_id, ts = emr._ns_cache["a"]
+        emr._ns_cache["a"] = (vc_id, ts - EMRContainers.NS_CACHE_TTL - 1)
+        emr.client.pages = [[("a", "vc-a2")]]
+
+        self.assertEqual(await emr.get_cluster_by_ns("a"), "vc-a2")
+        self.assertEqual(emr.client.listings, 2)
+
+    async def testStopsAtFirstPageMatch(self):
+        emr = self._emr([[("a", "vc-a"), ("a", "vc-a-dup")], [("b", "vc-b")]])
+
+        self.assertEqual(await emr.get_cluster_by_ns("a"), "vc-a")
+        self.assertEqual(emr.client.pages_fetched, 1)
+        # the batch path follows the same first-match rule
+        self.assertEqual(await emr.get_clusters_by_ns(["a", "b"]), {"a": "vc-a", "b": "vc-b"})
+        self.assertEqual(emr.client.listings, 2)
+
+    async def testBatchAndConcurrentLookupsShareOneListing(self):
+        emr = self._emr([[("a", "vc-a")], [("b", "vc-b")]])
+
+        self.assertEqual(
+            await emr.get_clusters_by_ns(["a", "b", "missing"]),
+            {"a": "vc-a", "b": "vc-b"},
         )
-        print(resp)
+        self.assertEqual(emr.client.listings, 1)
+
+        emr = self._emr([[("a", "vc-a")]])
+        ids = await asyncio.gather(*(emr.get_cluster_by_ns("a") for _ in range(5)))
+        self.assertEqual(ids, ["vc-a"] * 5)
+        self.assertEqual(emr.client.listings, 1)
+
+# python3 -m unittest emr_containers.PollerTestClass
+class PollerTestClass(unittest.IsolatedAsyncioTestCase):
 
-    def testListClusters(self):
+    async def testWaiterCancelledByClose(self):
         emr = EMRContainers('us-east-1')
+        emr.client = _StubJobRunsClient(active=["job-1"])
 
-        resp = emr.list_clusters("EKS", ["RUNNING"])
-        print(resp)
+        waiter = asyncio.create_task(emr.wait_for_job("job-1", "vc-1"))
+        await asyncio.sleep(0)
+        await emr.close()
 
-    def testGetClusterByNs(self):
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertFalse(emr._job_waits)
+
+    async def testListingErrorOnlyFailsItsCluster(self):
         emr = EMRContainers('us-east-1')
+        emr.client = _StubJobRunsClient(
+            active=["job-1"],
+            errors={"vc-bad": RuntimeError("ThrottlingException")},
+        )
 
-        ns = "emr-eks-workshop-namespace"
-        id = emr.get_cluster_by_ns(ns)
-        print("Virtual-Cluster-Id " + id + " for namespace " + ns)
+        with unittest.mock.patch.object(EMRContainers, 'POLL_INTERVAL', 0):
+            good = asyncio.create_task(emr.wait_for_job("job-1", "vc-1"))
+            with self.assertRaisesRegex(RuntimeError, "ThrottlingException"):
+                await emr.wait_for_job("job-2", "vc-bad")
 
-        ns1 = "emr"
-        id1 = emr.get_cluster_by_ns(ns1)
-        print("Virtual-Cluster-Id " + id1 + " for namespace " + ns1)
+            self.assertFalse(good.done())
+            emr.client.active.clear()
+            job_run = await good
 
-        ns2 = "non-exiting-emr"
-        id2 = emr.get_cluster_by_ns(ns2)
-        if id2 is None:
-            print("Virtual-Cluster-Id for namespace " + ns2 + " does not exist")
-        
+        self.assertEqual(job_run["state"], "COMPLETED")
+        await emr.close()
+
+    async def testUnlistedJobIsConfirmedByDescribe(self):
+        emr = EMRContainers('us-east-1')
+        # never listed, as right after StartJobRun, but still PENDING for the first two describes
+        emr.client = _StubJobRunsClient(states={"job-1": ["PENDING", "PENDING", "COMPLETED"]})
+
+        with unittest.mock.patch.object(EMRContainers, 'POLL_INTERVAL', 0):
+            job_run = await emr.wait_for_job("job-1", "vc-1")
+
+        self.assertEqual(job_run["state"], "COMPLETED")
+        self.assertEqual(emr.client.states["job-1"], ["COMPLETED"])
+        await emr.close()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file